@@ -1,16 +1,26 @@
 """Main console application for Databricks SQL Client demo."""
 
+import asyncio
+import json
 import os
+import re
 import sys
+import threading
 import time
-from typing import Optional
+from concurrent.futures import Future
+from contextlib import AbstractContextManager, nullcontext, suppress
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Optional
 
-from azure.identity import DefaultAzureCredential, InteractiveBrowserCredential
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Prompt, IntPrompt
+from rich.spinner import Spinner
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from rich.text import Text
 
 from softsense_databricks_sqlclient import DatabricksConfig, SqlWarehouseClient
 from softsense_databricks_sqlclient.exceptions import (
@@ -20,39 +30,210 @@ from softsense_databricks_sqlclient.exceptions import (
 
 console = Console()
 
+# Entra ID scope of the Azure Databricks resource, built the way the SDK builds it from
+# DatabricksConfig.AzureResourceId, so a token fetched here is the one the SDK asks for
+DATABRICKS_RESOURCE_ID = "2ff814a6-3304-4ab8-85cb-cd0e6f879c1d"
+DATABRICKS_TOKEN_SCOPE = f"https://{DATABRICKS_RESOURCE_ID}/.default"
 
-def get_configuration() -> Optional[DatabricksConfig]:
-    """Get Databricks configuration from environment or user input."""
-    workspace_url = os.getenv("DATABRICKS_WORKSPACE_URL")
-    access_token = os.getenv("DATABRICKS_TOKEN")
-    demo_mode = os.getenv("DEMO_MODE") == "true"
+# Longer than AzureCliCredential's 10 s process timeout, so a slow `az` login still succeeds
+CREDENTIAL_CHECK_TIMEOUT_SECONDS = 15.0
+
+# Cached tokens are renewed this long before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Rows shown in result previews; also used to build the LIMIT sent to the warehouse
+PREVIEW_ROWS = 10
+TABLES_PREVIEW_ROWS = 20
+
+QUICK_QUERY_SQL = (
+    "SELECT current_timestamp() as timestamp, current_user() as user, "
+    f"current_database() as database LIMIT {PREVIEW_ROWS}"
+)
+
+_LIMIT_PATTERN = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_SELECT_PATTERN = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# A CTE list may precede DML, which cannot be wrapped in a subquery
+_DML_PATTERN = re.compile(r"\b(INSERT|MERGE|UPDATE|DELETE)\b", re.IGNORECASE)
+
+# Parsed once; success lines copy it and append plain text instead of re-parsing markup
+_CHECK = Text.from_markup("[green]✓[/green] ")
+
+# Rows between counter updates in plain output mode
+PLAIN_PROGRESS_ROWS = 1000
+
+# Static banner and menu, parsed once instead of on every menu iteration
+BANNER = Text.from_markup(
+    "[bold blue]" + "=" * 60 + "[/bold blue]\n"
+    "[bold blue]         DATABRICKS SQL CLIENT DEMO[/bold blue]\n"
+    "[bold blue]" + "=" * 60 + "[/bold blue]\n"
+)
+MENU = Text.from_markup(
+    "[yellow]What would you like to do?[/yellow]\n"
+    "1. Quick Query\n"
+    "2. Stream Large Dataset\n"
+    "3. Explore Tables\n"
+    "4. Custom Query\n"
+    "5. Configuration Info\n"
+    "6. Exit\n"
+)
+MENU_CHOICES = ("1", "2", "3", "4", "5", "6")
+MENU_PROMPT = Text.assemble(
+    "Enter your choice ", (f"[{'/'.join(MENU_CHOICES)}]", "bold magenta"), ": "
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment-driven settings, read once at startup."""
+
+    workspace_url: Optional[str] = None
+    access_token: Optional[str] = None
+    warehouse_id: Optional[str] = None
+    demo_mode: bool = False
+    demo_query: Optional[str] = None
+    demo_limit: int = 10
+    plain_output: bool = False
+    skip_managed_identity: bool = False
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Read settings from environment variables.
+
+        Raises ``ValueError`` if demo mode is on and DEMO_LIMIT is not an integer; outside
+        demo mode DEMO_LIMIT is not used and is ignored.
+        """
+        demo_mode = os.getenv("DEMO_MODE") == "true"
+        return cls(
+            workspace_url=os.getenv("DATABRICKS_WORKSPACE_URL"),
+            access_token=os.getenv("DATABRICKS_TOKEN"),
+            warehouse_id=os.getenv("DATABRICKS_WAREHOUSE_ID"),
+            demo_mode=demo_mode,
+            demo_query=os.getenv("DEMO_QUERY"),
+            demo_limit=int(os.getenv("DEMO_LIMIT", "10")) if demo_mode else 10,
+            plain_output=os.getenv("DATABRICKS_PLAIN") == "1" or not sys.stdout.isatty(),
+            skip_managed_identity=os.getenv("DATABRICKS_SKIP_MANAGED_IDENTITY") == "1",
+        )
+
+
+class StreamStatus:
+    """Single-line spinner showing rows streamed and throughput, redrawn by ``Live``."""
+
+    def __init__(self, total: int) -> None:
+        self.row_count = 0
+        self._total = total
+        self._start_time = time.monotonic()
+        self._spinner = Spinner("dots", style="green")
+
+    def __rich__(self) -> Spinner:
+        elapsed = time.monotonic() - self._start_time
+        rate = self.row_count / elapsed if elapsed > 0 else 0.0
+        self._spinner.text = Text(
+            f"Streamed {self.row_count} of {self._total} rows @ {rate:.0f}/s", style="green"
+        )
+        return self._spinner
+
+
+@dataclass
+class PreviewResult:
+    """First rows of a streamed query, shaped like a query result for display."""
+
+    columns: list[tuple[str, str]] = field(default_factory=list)
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    has_more: bool = False
+
+
+class CachingCredential:
+    """Wrap a credential and reuse its tokens until shortly before they expire.
+
+    The SDK asks for a token on every request and ``DefaultAzureCredential`` re-runs its
+    source (e.g. ``az``) each time, so the token validated at startup is kept for the queries.
+    """
+
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._tokens: dict[tuple[Any, ...], Any] = {}
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        if kwargs.get("claims"):
+            # Claims challenges must reach the real credential
+            return self.inner.get_token(*scopes, **kwargs)
+
+        options = {name: value for name, value in kwargs.items() if value is not None}
+        key = (scopes, tuple(sorted(options.items())))
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - TOKEN_REFRESH_MARGIN_SECONDS <= time.time():
+                token = self.inner.get_token(*scopes, **options)
+                self._tokens[key] = token
+            return token
+
+
+def check_credential(credential: Any, timeout: float = CREDENTIAL_CHECK_TIMEOUT_SECONDS) -> None:
+    """Request a Databricks token so credential failures surface before the first query.
+
+    Raises the credential's error, or ``concurrent.futures.TimeoutError`` (the builtin
+    ``TimeoutError`` from Python 3.11) if no token arrives within ``timeout`` seconds. The
+    probe runs on a daemon thread so a hung credential cannot block exit.
+    """
+    token: Future[Any] = Future()
+
+    def probe() -> None:
+        try:
+            token.set_result(credential.get_token(DATABRICKS_TOKEN_SCOPE))
+        except Exception as ex:
+            token.set_exception(ex)
+
+    threading.Thread(target=probe, daemon=True).start()
+    token.result(timeout=timeout)
+
+
+def get_configuration(settings: Settings) -> Optional[DatabricksConfig]:
+    """Get Databricks configuration from settings or user input."""
+    workspace_url = settings.workspace_url
+    access_token = settings.access_token
 
     if not workspace_url:
         console.print("[yellow]⚠[/yellow] DATABRICKS_WORKSPACE_URL not set")
         workspace_url = Prompt.ask("[green]Enter workspace URL[/green]")
 
-    # In demo mode, use InteractiveBrowserCredential
-    if demo_mode:
+    # azure.identity pulls in msal/cryptography, so it is only imported when a credential
+    # is actually built. In demo mode, use InteractiveBrowserCredential.
+    if settings.demo_mode:
+        from azure.identity import InteractiveBrowserCredential
+
         return DatabricksConfig(
             workspace_url=workspace_url,
             credential=InteractiveBrowserCredential(),
         )
 
-    # Try Azure Entra first, fallback to PAT
+    # A PAT in the environment wins; skip the Azure credential chain and its probes
+    if access_token:
+        return DatabricksConfig(
+            workspace_url=workspace_url,
+            access_token=access_token,
+        )
+
+    # Try Azure Entra, fallback to a prompted PAT
     try:
-        credential = DefaultAzureCredential()
+        from azure.identity import DefaultAzureCredential
+
+        # The managed identity probe is only skipped on explicit opt-out; IMDS hosts (VMs,
+        # VMSS, AKS) rely on it without advertising an endpoint
+        credential = DefaultAzureCredential(
+            exclude_managed_identity_credential=settings.skip_managed_identity,
+        )
+        # Construction never fails; fetch a token now so the PAT fallback happens here
+        # rather than inside the first query, and keep it for the queries
+        credential = CachingCredential(credential)
+        check_credential(credential)
         return DatabricksConfig(
             workspace_url=workspace_url,
             credential=credential,
         )
     except Exception:
-        if not access_token:
-            console.print(
-                "[yellow]⚠[/yellow] Azure Entra failed and DATABRICKS_TOKEN not set"
-            )
-            access_token = Prompt.ask(
-                "[green]Enter access token[/green]", password=True
-            )
+        console.print("[yellow]⚠[/yellow] Azure Entra failed and DATABRICKS_TOKEN not set")
+        access_token = Prompt.ask("[green]Enter access token[/green]", password=True)
 
         return DatabricksConfig(
             workspace_url=workspace_url,
@@ -65,7 +246,15 @@ def get_auth_method_name(config: DatabricksConfig) -> str:
     if config.credential is None:
         return "Personal Access Token"
 
-    credential_type = type(config.credential).__name__
+    credential = config.credential
+    if isinstance(credential, CachingCredential):
+        credential = credential.inner
+    return _credential_label(type(credential).__name__)
+
+
+@lru_cache(maxsize=8)
+def _credential_label(credential_type: str) -> str:
+    """Get the display label for a credential type name."""
     if credential_type == "InteractiveBrowserCredential":
         return "Azure Entra ID (Interactive Browser)"
     elif credential_type == "DefaultAzureCredential":
@@ -74,26 +263,91 @@ def get_auth_method_name(config: DatabricksConfig) -> str:
         return f"Azure Entra ID ({credential_type})"
 
 
-def execute_quick_query(client: SqlWarehouseClient, warehouse_id: str) -> None:
-    """Execute a quick query to show current timestamp, user, and database."""
-    sql = "SELECT current_timestamp() as timestamp, current_user() as user, current_database() as database LIMIT 10"
+def print_success(message: str) -> None:
+    """Print a plain-text message after a green check mark."""
+    text = _CHECK.copy()
+    text.append(message)
+    console.print(text)
 
-    console.print(f"[dim]Executing:[/dim] {sql}")
+
+def with_preview_limit(sql: str, limit: int) -> str:
+    """Wrap a SELECT query that has no LIMIT in an outer LIMIT, so the warehouse stops early.
+
+    Wrapping rather than appending keeps clauses such as OFFSET valid, and the newline before
+    the closing parenthesis stops a trailing ``--`` comment from swallowing it. Text that
+    mentions INSERT, MERGE, UPDATE or DELETE is left alone, since ``WITH`` may introduce DML.
+    """
+    body = sql.strip().rstrip(";")
+    if (
+        not _SELECT_PATTERN.match(body)
+        or _LIMIT_PATTERN.search(body)
+        or _DML_PATTERN.search(body)
+        or ";" in body
+    ):
+        return sql
+    return f"SELECT * FROM (\n{body}\n) LIMIT {limit}"
+
+
+def status(message: str, plain: bool = False) -> AbstractContextManager[Any]:
+    """Show a spinner while the block runs, unless ``plain`` output is requested."""
+    if plain:
+        return nullcontext()
+    return console.status(f"[bold green]{message}", spinner="dots")
+
+
+def fetch_preview(
+    client: SqlWarehouseClient, warehouse_id: str, sql: str, n: int = PREVIEW_ROWS
+) -> PreviewResult:
+    """Stream a query and keep only its first ``n`` rows.
+
+    SELECT queries without a LIMIT are wrapped in ``LIMIT n + 1`` so the warehouse never
+    produces rows that would be thrown away. The NDJSON stream carries column names with every
+    row, so the first row doubles as the column header. The stream is closed after ``n + 1`` rows, so
+    later result chunks are never downloaded.
+    """
+    stream = client.execute_query_stream_ndjson(warehouse_id, with_preview_limit(sql, n + 1))
+    try:
+        rows = [json.loads(line) for line in islice(stream, n + 1)]
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+    columns = [(name, "") for name in rows[0]] if rows else []
+    return PreviewResult(columns=columns, rows=rows[:n], has_more=len(rows) > n)
+
+
+def fetch_quick_query(client: SqlWarehouseClient, warehouse_id: str) -> tuple[PreviewResult, float]:
+    """Run the quick query and return its rows with elapsed seconds."""
+    start_time = time.monotonic()
+    result = fetch_preview(client, warehouse_id, QUICK_QUERY_SQL)
+    return result, time.monotonic() - start_time
+
+
+def execute_quick_query(
+    client: SqlWarehouseClient,
+    warehouse_id: str,
+    settings: Settings,
+    prefetched: Optional[tuple[PreviewResult, float]] = None,
+) -> None:
+    """Execute a quick query to show current timestamp, user, and database.
+
+    If ``prefetched`` is given, those results are rendered instead of running the query.
+    """
+    console.print(f"[dim]Executing:[/dim] {QUICK_QUERY_SQL}")
     console.print()
 
-    start_time = time.time()
-    with console.status("[bold green]Executing query...", spinner="dots"):
-        result = client.execute_query(warehouse_id, sql)
-    elapsed = time.time() - start_time
+    if prefetched is None:
+        with status("Executing query...", settings.plain_output):
+            prefetched = fetch_quick_query(client, warehouse_id)
+    result, elapsed = prefetched
 
     display_results_table(result)
-    console.print(
-        f"[green]✓[/green] Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds"
-    )
+    print_success(f"Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds")
 
 
-def stream_dataset(client: SqlWarehouseClient, warehouse_id: str) -> None:
-    """Stream a large dataset with progress bar."""
+def stream_dataset(client: SqlWarehouseClient, warehouse_id: str, settings: Settings) -> None:
+    """Stream a large dataset with a live row counter."""
     limit = IntPrompt.ask("How many rows to stream?", default=100)
     sql = f"SELECT * FROM samples.nyctaxi.trips LIMIT {limit}"
 
@@ -101,136 +355,200 @@ def stream_dataset(client: SqlWarehouseClient, warehouse_id: str) -> None:
     console.print()
 
     row_count = 0
-    start_time = time.time()
+    start_time = time.monotonic()
 
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        SpinnerColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task("[green]Streaming rows", total=limit)
+    if settings.plain_output:
+        # Plain mode keeps Rich out of the per-row loop entirely. A terminal gets one counter
+        # line rewritten in place; pipes and log files get one line per update.
+        overwrite = sys.stdout.isatty()
+        counter_format = "\r{} rows" if overwrite else "{} rows\n"
+        for _ in client.execute_query_stream(warehouse_id, sql):
+            row_count += 1
+            if row_count % PLAIN_PROGRESS_ROWS == 0:
+                sys.stdout.write(counter_format.format(row_count))
+                sys.stdout.flush()
+
+        if overwrite and row_count >= PLAIN_PROGRESS_ROWS:
+            sys.stdout.write("\n")
 
+        elapsed = time.monotonic() - start_time
+        print_success(f"Streamed {row_count} rows in {elapsed:.2f} seconds")
+        return
+
+    # Live redraws only the status line, on its own refresh thread at most 10 times a
+    # second, so the loop just publishes the count
+    stream_status = StreamStatus(total=limit)
+    with Live(stream_status, console=console, refresh_per_second=10, transient=True):
         for _ in client.execute_query_stream(warehouse_id, sql):
             row_count += 1
-            progress.update(task, advance=1)
+            stream_status.row_count = row_count
 
-    elapsed = time.time() - start_time
-    console.print(f"[green]✓[/green] Streamed {row_count} rows in {elapsed:.2f} seconds")
+    elapsed = time.monotonic() - start_time
+    print_success(f"Streamed {row_count} rows in {elapsed:.2f} seconds")
 
 
-def stream_dataset_demo(client: SqlWarehouseClient, warehouse_id: str, limit: int) -> None:
-    """Stream a dataset with a fixed limit (for demo mode)."""
+def get_demo_sql(settings: Settings) -> str:
+    """Get the SQL for the demo dataset query."""
     # Use a more universally available sample dataset
-    sql = os.getenv("DEMO_QUERY") or f"SELECT * FROM `samples`.`accuweather`.`forecast_daily_calendar_metric` LIMIT {limit}"
+    return settings.demo_query or (
+        "SELECT * FROM `samples`.`accuweather`.`forecast_daily_calendar_metric` "
+        f"LIMIT {settings.demo_limit}"
+    )
+
+
+def collect_dataset_preview(
+    client: SqlWarehouseClient, warehouse_id: str, sql: str, n: int = PREVIEW_ROWS
+) -> tuple[PreviewResult, int, float]:
+    """Stream a query and return its first ``n`` rows, total row count and elapsed seconds.
+
+    Does not touch the console, so it is safe to run on a worker thread.
+    """
+    row_count = 0
+    preview: list[dict[str, Any]] = []
+    start_time = time.monotonic()
+    for i, line in enumerate(client.execute_query_stream_ndjson(warehouse_id, sql)):
+        row_count += 1
+        if i < n:
+            preview.append(json.loads(line))
+    elapsed = time.monotonic() - start_time
+
+    columns = [(name, "") for name in preview[0]] if preview else []
+    result = PreviewResult(columns=columns, rows=preview, has_more=row_count > len(preview))
+    return result, row_count, elapsed
+
+
+def stream_dataset_demo(
+    client: SqlWarehouseClient,
+    warehouse_id: str,
+    settings: Settings,
+    prefetched: Optional[tuple[PreviewResult, int, float]] = None,
+) -> None:
+    """Stream a dataset with the configured demo limit (for demo mode).
+
+    If ``prefetched`` is given, those results are rendered instead of running the query.
+    """
+    sql = get_demo_sql(settings)
 
     console.print(f"[dim]Executing:[/dim] {sql}")
     console.print()
 
-    # Execute query and display results
-    start_time = time.time()
-    with console.status("[bold green]Executing query...", spinner="dots"):
-        result = client.execute_query(warehouse_id, sql)
-    elapsed = time.time() - start_time
+    # Stream the query, keeping only the preview rows for display
+    if prefetched is None:
+        with status("Executing query...", settings.plain_output):
+            prefetched = collect_dataset_preview(client, warehouse_id, sql)
+    result, row_count, elapsed = prefetched
 
-    console.print(f"[green]✓[/green] Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds")
+    print_success(f"Retrieved {row_count} rows in {elapsed:.2f} seconds")
     console.print()
 
-    # Display first 10 rows in a table
-    console.print(f"[yellow]First {min(10, len(result.rows))} rows:[/yellow]")
+    # Display the preview rows in a table
+    console.print(f"[yellow]First {len(result.rows)} rows:[/yellow]")
     display_results_table(result)
 
 
-def explore_tables(client: SqlWarehouseClient, warehouse_id: str) -> None:
+def explore_tables(client: SqlWarehouseClient, warehouse_id: str, settings: Settings) -> None:
     """Explore available tables in the current database."""
+    # SHOW TABLES works on every metastore; fetch_preview caps it by closing the stream
     sql = "SHOW TABLES"
 
-    start_time = time.time()
-    with console.status("[bold green]Fetching tables...", spinner="dots"):
-        result = client.execute_query(warehouse_id, sql)
-    elapsed = time.time() - start_time
+    start_time = time.monotonic()
+    with status("Fetching tables...", settings.plain_output):
+        result = fetch_preview(client, warehouse_id, sql, n=TABLES_PREVIEW_ROWS)
+    elapsed = time.monotonic() - start_time
+    rows = result.rows
+    n_rows = len(rows)
+    col_names = [col_name for col_name, _ in result.columns]
 
-    if not result.rows:
+    if not n_rows:
         console.print("[yellow]No tables found in current database[/yellow]")
         return
 
     table = Table(title="[yellow]Available Tables[/yellow]", show_header=True)
 
     # Add columns
-    for column in result.columns:
-        table.add_column(f"[blue]{column.name}[/blue]", justify="center")
+    for col_name in col_names:
+        table.add_column(f"[blue]{col_name}[/blue]", justify="center")
 
-    # Add rows (limit to 20)
-    for row in result.rows[:20]:
-        values = [row.get_string(col) or "NULL" for col in row.columns]
+    # Add rows (limited by the preview)
+    for row in rows:
+        raw = [row.get(col_name) for col_name in col_names]
+        values = ["NULL" if value is None else str(value) for value in raw]
         table.add_row(*values)
 
     console.print(table)
 
-    if len(result.rows) > 20:
-        console.print(f"[dim]Showing 20 of {len(result.rows)} tables[/dim]")
+    if result.has_more:
+        console.print(f"[dim]Showing first {n_rows} tables[/dim]")
 
-    console.print(f"[green]✓[/green] Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds")
+    print_success(f"Retrieved {n_rows} rows in {elapsed:.2f} seconds")
 
 
-def execute_custom_query(client: SqlWarehouseClient, warehouse_id: str) -> None:
+def execute_custom_query(client: SqlWarehouseClient, warehouse_id: str, settings: Settings) -> None:
     """Execute a custom SQL query."""
     sql = Prompt.ask("[green]Enter SQL query[/green]", default="SELECT 1 as test")
     console.print()
 
-    start_time = time.time()
-    with console.status("[bold green]Executing query...", spinner="dots"):
-        result = client.execute_query(warehouse_id, sql)
-    elapsed = time.time() - start_time
+    start_time = time.monotonic()
+    with status("Executing query...", settings.plain_output):
+        result = fetch_preview(client, warehouse_id, sql)
+    elapsed = time.monotonic() - start_time
 
     display_results_table(result)
-    console.print(f"[green]✓[/green] Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds")
+    print_success(f"Retrieved {len(result.rows)} rows in {elapsed:.2f} seconds")
 
 
 def display_results_table(result) -> None:
     """Display query results as a table."""
-    if not result.columns:
-        console.print("[yellow]No columns in result[/yellow]")
-        return
+    rows = result.rows
+    n_rows = len(rows)
+    cols = result.columns
+    n_cols = len(cols)
 
-    if not result.rows:
+    if not n_rows:
         console.print("[yellow]No rows in result[/yellow]")
         return
 
+    if not n_cols:
+        console.print("[yellow]No columns in result[/yellow]")
+        return
+
     table = Table(show_header=True)
 
     # Limit columns to display (max 10 columns to fit in console)
     max_columns = 10
-    columns_to_show = result.columns[:max_columns]
+    columns_to_show = cols[:max_columns]
 
     # Add columns
-    for column in columns_to_show:
-        table.add_column(
-            f"[blue]{column[0]}[/blue]\n[dim]{column[1]}[/dim]"
-        )
-
-    # Add rows (limit to 10 for display)
-    rows_to_show = min(10, len(result.rows))
-    for row in result.rows[:rows_to_show]:
-        values = []
-        for col_name, _ in columns_to_show:
-            value = row.get(col_name)
-            if value is None or value == "":
-                values.append("[dim]NULL[/dim]")
-            else:
-                # Truncate long values
-                str_value = str(value)
-                values.append(str_value[:27] + "..." if len(str_value) > 30 else str_value)
+    for col_name, col_type in columns_to_show:
+        header = f"[blue]{col_name}[/blue]"
+        if col_type:
+            header += f"\n[dim]{col_type}[/dim]"
+        table.add_column(header)
+
+    # Add rows (limited to the preview size), truncating long values
+    col_names = [col_name for col_name, _ in columns_to_show]
+    rows_to_show = min(PREVIEW_ROWS, n_rows)
+    for row in rows[:rows_to_show]:
+        raw = [row.get(col_name) for col_name in col_names]
+        values = [
+            (
+                "[dim]NULL[/dim]"
+                if value is None or value == ""
+                else (text[:27] + "..." if len(text := str(value)) > 30 else text)
+            )
+            for value in raw
+        ]
         table.add_row(*values)
 
     console.print(table)
 
-    if len(result.columns) > max_columns:
-        console.print(f"[dim]Showing {max_columns} of {len(result.columns)} columns[/dim]")
+    if n_cols > max_columns:
+        console.print(f"[dim]Showing {max_columns} of {n_cols} columns[/dim]")
 
-    if len(result.rows) > rows_to_show:
-        console.print(f"[dim]Showing {rows_to_show} of {len(result.rows)} rows[/dim]")
+    if n_rows > rows_to_show:
+        console.print(f"[dim]Showing {rows_to_show} of {n_rows} rows[/dim]")
+    elif getattr(result, "has_more", False):
+        console.print(f"[dim]Showing first {rows_to_show} rows[/dim]")
 
 
 def show_configuration_info(config: DatabricksConfig, warehouse_id: str) -> None:
@@ -248,106 +566,187 @@ def show_configuration_info(config: DatabricksConfig, warehouse_id: str) -> None
     console.print(panel)
 
 
-def main() -> int:
-    """Main entry point for the application."""
-    # Display banner
-    console.print("[bold blue]" + "=" * 60 + "[/bold blue]")
-    console.print("[bold blue]         DATABRICKS SQL CLIENT DEMO[/bold blue]")
-    console.print("[bold blue]" + "=" * 60 + "[/bold blue]")
-    console.print()
+def read_single_key() -> str:
+    """Read one keypress from the terminal without waiting for Enter.
 
-    # Get configuration
-    config = get_configuration()
-    if config is None:
-        console.print("[red]✗[/red] Configuration failed. Please set environment variables.")
-        return 1
+    Raises ``EOFError`` at end of input or on Ctrl+D (Ctrl+Z on Windows).
+    """
+    if sys.platform == "win32":
+        import msvcrt
 
-    # Create client
-    client = SqlWarehouseClient(config)
+        key = msvcrt.getwch()
+        if key == "\x03":
+            raise KeyboardInterrupt
+        if key == "\x1a":
+            raise EOFError
+        return key
 
-    # Get warehouse ID
-    warehouse_id = os.getenv("DATABRICKS_WAREHOUSE_ID")
-    if not warehouse_id:
-        warehouse_id = Prompt.ask("Enter [green]SQL Warehouse ID[/green]")
+    import termios
+    import tty
 
-    # Show connection status
-    console.print(f"[green]✓[/green] Connected to: [blue]{config.workspace_url}[/blue]")
-    console.print(
-        f"[green]✓[/green] Authentication: [blue]{get_auth_method_name(config)}[/blue]"
-    )
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        # TCSANOW rather than the default TCSAFLUSH, which would drop typed-ahead keys
+        tty.setcbreak(fd, termios.TCSANOW)
+        key = sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    if key in ("", "\x04"):
+        raise EOFError
+    return key
+
+
+def read_menu_choice() -> str:
+    """Read a menu choice as a single keypress, or a prompted line when stdin is not a TTY.
+
+    End of input selects Exit.
+    """
+    try:
+        if not sys.stdin.isatty():
+            return Prompt.ask("Enter your choice", choices=list(MENU_CHOICES))
+
+        console.print(MENU_PROMPT, end="")
+        while (choice := read_single_key()) not in MENU_CHOICES:
+            pass
+    except EOFError:
+        choice = MENU_CHOICES[-1]
+    console.print(choice)
+    return choice
+
+
+def warm_up_warehouse(client: SqlWarehouseClient, warehouse_id: str) -> None:
+    """Run a trivial query so a cold warehouse starts; failures are left to the real queries."""
+    with suppress(Exception):
+        client.execute_query(warehouse_id, "SELECT 1")
+
+
+async def run_demo(
+    config: DatabricksConfig,
+    client: SqlWarehouseClient,
+    warehouse_id: str,
+    settings: Settings,
+) -> None:
+    """Run the automated demo, executing its queries concurrently.
+
+    Both queries run on worker threads and overlap at the warehouse; rendering happens
+    afterwards on the main thread because Rich is not thread-safe.
+    """
+    console.print("[yellow]═══ Configuration Info ═══[/yellow]")
+    show_configuration_info(config, warehouse_id)
     console.print()
 
-    # Check if running in demo mode
-    demo_mode = os.getenv("DEMO_MODE") == "true"
+    # Sign in once on the main thread before fanning out. Neither the SDK nor
+    # InteractiveBrowserCredential serialises token requests, so two cold queries would each
+    # open a browser login; afterwards both hit the MSAL cache.
+    if config.credential is not None:
+        config.credential.get_token(DATABRICKS_TOKEN_SCOPE)
+
+    with status("Executing demo queries...", settings.plain_output):
+        quick, dataset = await asyncio.gather(
+            asyncio.to_thread(fetch_quick_query, client, warehouse_id),
+            asyncio.to_thread(
+                collect_dataset_preview, client, warehouse_id, get_demo_sql(settings)
+            ),
+        )
 
-    if demo_mode:
-        # Run automated demo
-        console.print("[cyan]Running in demo mode (non-interactive)[/cyan]")
-        console.print()
+    console.print("[yellow]═══ Quick Query Demo ═══[/yellow]")
+    execute_quick_query(client, warehouse_id, settings, prefetched=quick)
+    console.print()
 
-        try:
-            console.print("[yellow]═══ Configuration Info ═══[/yellow]")
-            show_configuration_info(config, warehouse_id)
-            console.print()
+    console.print(f"[yellow]═══ Query Dataset Demo ({settings.demo_limit} rows) ═══[/yellow]")
+    stream_dataset_demo(client, warehouse_id, settings, prefetched=dataset)
+    console.print()
 
-            console.print("[yellow]═══ Quick Query Demo ═══[/yellow]")
-            execute_quick_query(client, warehouse_id)
-            console.print()
 
-            demo_limit = int(os.getenv("DEMO_LIMIT", "10"))
-            console.print(f"[yellow]═══ Query Dataset Demo ({demo_limit} rows) ═══[/yellow]")
-            stream_dataset_demo(client, warehouse_id, demo_limit)
-            console.print()
+def main() -> int:
+    """Main entry point for the application."""
+    # Display banner
+    console.print(BANNER)
 
-            console.print("[green]✓ Demo completed successfully![/green]")
-            return 0
-        except DatabricksAuthenticationException as ex:
-            console.print(f"[red]✗ Authentication failed:[/red] {ex}")
-            return 1
-        except DatabricksException as ex:
-            console.print(f"[red]✗ Databricks error:[/red] {ex}")
-            return 1
-        except Exception as ex:
-            console.print(f"[red]✗ Error:[/red] {ex}")
-            return 1
-
-    # Main menu loop
-    while True:
-        console.print("[yellow]What would you like to do?[/yellow]")
-        console.print("1. Quick Query")
-        console.print("2. Stream Large Dataset")
-        console.print("3. Explore Tables")
-        console.print("4. Custom Query")
-        console.print("5. Configuration Info")
-        console.print("6. Exit")
-        console.print()
+    # Read environment settings once
+    try:
+        settings = Settings.from_env()
+    except ValueError as ex:
+        console.print(f"[red]✗[/red] Invalid settings: {ex}")
+        return 1
+
+    # Get configuration
+    config = get_configuration(settings)
+    if config is None:
+        console.print("[red]✗[/red] Configuration failed. Please set environment variables.")
+        return 1
 
-        choice = Prompt.ask("Enter your choice", choices=["1", "2", "3", "4", "5", "6"])
+    # Create the client once and reuse it for every action. It owns a single pooled
+    # HttpClient, so connections stay alive across menu selections instead of paying
+    # TLS setup per query; leaving the block disposes it.
+    with SqlWarehouseClient(config) as client:
+        # Get warehouse ID
+        warehouse_id = settings.warehouse_id
+        if not warehouse_id:
+            warehouse_id = Prompt.ask("Enter [green]SQL Warehouse ID[/green]")
+
+        # Show connection status
+        console.print(f"[green]✓[/green] Connected to: [blue]{config.workspace_url}[/blue]")
+        console.print(
+            f"[green]✓[/green] Authentication: [blue]{get_auth_method_name(config)}[/blue]"
+        )
         console.print()
 
-        try:
-            if choice == "1":
-                execute_quick_query(client, warehouse_id)
-            elif choice == "2":
-                stream_dataset(client, warehouse_id)
-            elif choice == "3":
-                explore_tables(client, warehouse_id)
-            elif choice == "4":
-                execute_custom_query(client, warehouse_id)
-            elif choice == "5":
-                show_configuration_info(config, warehouse_id)
-            elif choice == "6":
-                console.print("[green]Goodbye![/green]")
+        # Check if running in demo mode
+        if settings.demo_mode:
+            # Run automated demo
+            console.print("[cyan]Running in demo mode (non-interactive)[/cyan]")
+            console.print()
+
+            try:
+                asyncio.run(run_demo(config, client, warehouse_id, settings))
+                console.print("[green]✓ Demo completed successfully![/green]")
                 return 0
+            except DatabricksAuthenticationException as ex:
+                console.print(f"[red]✗ Authentication failed:[/red] {ex}")
+                return 1
+            except DatabricksException as ex:
+                console.print(f"[red]✗ Databricks error:[/red] {ex}")
+                return 1
+            except Exception as ex:
+                console.print(f"[red]✗ Error:[/red] {ex}")
+                return 1
+
+        # Wake the warehouse in the background while the user reads the menu
+        threading.Thread(target=warm_up_warehouse, args=(client, warehouse_id), daemon=True).start()
+
+        # Main menu loop
+        while True:
+            console.print(MENU)
+
+            choice = read_menu_choice()
+            console.print()
 
-        except DatabricksAuthenticationException as ex:
-            console.print(f"[red]✗ Authentication failed:[/red] {ex}")
-        except DatabricksException as ex:
-            console.print(f"[red]✗ Databricks error:[/red] {ex}")
-        except Exception as ex:
-            console.print(f"[red]✗ Error:[/red] {ex}")
+            try:
+                if choice == "1":
+                    execute_quick_query(client, warehouse_id, settings)
+                elif choice == "2":
+                    stream_dataset(client, warehouse_id, settings)
+                elif choice == "3":
+                    explore_tables(client, warehouse_id, settings)
+                elif choice == "4":
+                    execute_custom_query(client, warehouse_id, settings)
+                elif choice == "5":
+                    show_configuration_info(config, warehouse_id)
+                elif choice == "6":
+                    console.print("[green]Goodbye![/green]")
+                    return 0
+
+            except DatabricksAuthenticationException as ex:
+                console.print(f"[red]✗ Authentication failed:[/red] {ex}")
+            except DatabricksException as ex:
+                console.print(f"[red]✗ Databricks error:[/red] {ex}")
+            except Exception as ex:
+                console.print(f"[red]✗ Error:[/red] {ex}")
 
-        console.print()
+            console.print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""Tests for the preview LIMIT rewriter."""
+
+from databricks_example.app import with_preview_limit
+
+
+def test_wraps_select_without_limit() -> None:
+    assert (
+        with_preview_limit("SELECT 1 as test", 11)
+        == "SELECT * FROM (\nSELECT 1 as test\n) LIMIT 11"
+    )
+
+
+def test_wraps_query_with_offset() -> None:
+    sql = "SELECT * FROM t ORDER BY x OFFSET 5"
+    assert with_preview_limit(sql, 11) == f"SELECT * FROM (\n{sql}\n) LIMIT 11"
+
+
+def test_trailing_line_comment_does_not_hide_limit() -> None:
+    assert (
+        with_preview_limit("SELECT 1 -- note", 11)
+        == "SELECT * FROM (\nSELECT 1 -- note\n) LIMIT 11"
+    )
+
+
+def test_strips_trailing_semicolon() -> None:
+    assert (
+        with_preview_limit("select * from t;", 11) == "SELECT * FROM (\nselect * from t\n) LIMIT 11"
+    )
+
+
+def test_leaves_multiple_statements_unchanged() -> None:
+    sql = "SELECT 1; SELECT 2"
+    assert with_preview_limit(sql, 11) == sql
+
+
+def test_wraps_cte_query() -> None:
+    sql = "WITH c AS (SELECT 1 x) SELECT * FROM c"
+    assert with_preview_limit(sql, 11) == f"SELECT * FROM (\n{sql}\n) LIMIT 11"
+
+
+def test_leaves_cte_followed_by_dml_unchanged() -> None:
+    for sql in (
+        "WITH c AS (SELECT 1 x) INSERT INTO t SELECT * FROM c",
+        "WITH c AS (SELECT 1 x) MERGE INTO t USING c ON t.x = c.x WHEN MATCHED THEN DELETE",
+    ):
+        assert with_preview_limit(sql, 11) == sql
+
+
+def test_leaves_existing_limit_unchanged() -> None:
+    assert with_preview_limit("SELECT 1 LIMIT 3", 11) == "SELECT 1 LIMIT 3"
+
+
+def test_leaves_non_select_statements_unchanged() -> None:
+    assert with_preview_limit("SHOW TABLES", 11) == "SHOW TABLES"